@@ -1,13 +1,16 @@
 """FastAPI web application."""
 
-from typing import Any, Dict
+import secrets
+from typing import Any, Dict, Literal, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
 
 from gen_ai_rag_langchain.config import get_config
 from gen_ai_rag_langchain.core import RAGSystem
+from gen_ai_rag_langchain.profiling import MIN_SAMPLE_INTERVAL, profiler
 
 # Initialize configuration
 config = get_config()
@@ -41,6 +44,9 @@ class QueryRequest(BaseModel):
     query: str
     max_tokens: int = 4000
     temperature: float = 0.7
+    top_k: Optional[int] = Field(default=None, gt=0)
+    mmr_lambda: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+    mmr_pool_size: Optional[int] = Field(default=None, gt=0)
 
 
 class QueryResponse(BaseModel):
@@ -59,6 +65,25 @@ class HealthResponse(BaseModel):
     version: str
 
 
+class ProfileRequest(BaseModel):
+    """Profiling session request model."""
+
+    mode: Literal["cprofile", "sampling"] = "cprofile"
+    duration: Optional[float] = Field(default=None, gt=0)
+    requests: Optional[int] = Field(default=None, gt=0)
+    interval: float = Field(default=0.005, ge=MIN_SAMPLE_INTERVAL)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Reject admin requests without the configured token."""
+    if not config.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(
+        x_admin_token, config.admin_token
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
 # Routes
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -74,12 +99,78 @@ async def health_check():
 async def process_query(request: QueryRequest):
     """Process a query through the RAG system."""
     try:
-        result = rag_system.process_query(request.query)
+        if profiler.active:
+            with profiler.profile():
+                result = _run_query(request)
+        else:
+            result = _run_query(request)
         return QueryResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _run_query(request: QueryRequest) -> Dict[str, Any]:
+    """Run a query request through the RAG system."""
+    return rag_system.process_query(
+        request.query,
+        top_k=request.top_k,
+        mmr_lambda=request.mmr_lambda,
+        mmr_pool_size=request.mmr_pool_size,
+    )
+
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin)])
+async def start_profiling(request: ProfileRequest) -> Dict[str, Any]:
+    """Profile a time window or the next N query requests."""
+    try:
+        return profiler.start(
+            mode=request.mode,
+            duration=request.duration,
+            requests=request.requests,
+            interval=request.interval,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def profiling_status() -> Dict[str, Any]:
+    """Return the running session's state or the last finished report."""
+    return profiler.status()
+
+
+@app.delete("/admin/profile", dependencies=[Depends(require_admin)])
+async def stop_profiling() -> Dict[str, Any]:
+    """Stop profiling now and return the report."""
+    return {"report": profiler.stop()}
+
+
+@app.get(
+    "/admin/profile/collapsed",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def collapsed_stacks() -> str:
+    """Return the last report's stacks in flamegraph collapsed format."""
+    report = profiler.status().get("report")
+    if report is None:
+        raise HTTPException(status_code=404, detail="No profiling report")
+    if report["collapsed"] is None:
+        raise HTTPException(
+            status_code=409, detail="Collapsed stacks require a sampling session"
+        )
+    collapsed: str = report["collapsed"]
+    return collapsed
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """Close pooled provider connections."""
+    await rag_system.aclose()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -6,6 +6,7 @@ from typing import Optional
 
 from gen_ai_rag_langchain.config import get_config
 from gen_ai_rag_langchain.core import RAGSystem
+from gen_ai_rag_langchain.profiling import PROFILE_MODES, Profiler
 
 
 def main(args: Optional[list] = None) -> int:
@@ -45,6 +46,35 @@ def main(args: Optional[list] = None) -> int:
         default=0.7,
         help="Temperature for generation",
     )
+    query_parser.add_argument(
+        "--top-k",
+        type=int,
+        default=None,
+        help="Number of sources to keep after re-ranking",
+    )
+    query_parser.add_argument(
+        "--mmr-lambda",
+        type=float,
+        default=None,
+        help="MMR trade-off between relevance (1.0) and diversity (0.0)",
+    )
+    query_parser.add_argument(
+        "--mmr-pool-size",
+        type=int,
+        default=None,
+        help="Number of retrieved candidates to re-rank",
+    )
+    query_parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Profile the query and print per-function cumulative times",
+    )
+    query_parser.add_argument(
+        "--profile-output",
+        default=None,
+        help="Write collapsed stacks to this file (requires --profile sampling)",
+    )
 
     # Server command
     server_parser = subparsers.add_parser("server", help="Start the API server")
@@ -67,18 +97,46 @@ def main(args: Optional[list] = None) -> int:
         parser.print_help()
         return 1
 
+    if (
+        parsed_args.command == "query"
+        and parsed_args.profile_output
+        and parsed_args.profile != "sampling"
+    ):
+        parser.error("--profile-output requires --profile sampling")
+
     # Initialize components
     config = get_config()
     rag_system = RAGSystem(config.__dict__)
 
     try:
         if parsed_args.command == "query":
-            result = rag_system.process_query(parsed_args.text)
+            query_kwargs = {
+                "top_k": parsed_args.top_k,
+                "mmr_lambda": parsed_args.mmr_lambda,
+                "mmr_pool_size": parsed_args.mmr_pool_size,
+            }
+            report = None
+            if parsed_args.profile:
+                profiler = Profiler()
+                profiler.start(mode=parsed_args.profile, requests=1, interval=0.001)
+                with profiler.profile():
+                    result = rag_system.process_query(parsed_args.text, **query_kwargs)
+                report = profiler.stop()
+            else:
+                result = rag_system.process_query(parsed_args.text, **query_kwargs)
             print(f"Query: {result['query']}")
             print(f"Response: {result['response']}")
             print(f"Sources: {result['sources']}")
             print(f"Metadata: {result['metadata']}")
 
+            if report is not None:
+                print("Profile (cumulative seconds):")
+                for entry in report["functions"]:
+                    print(f"  {entry['cumulative_time']:.6f}  {entry['function']}")
+                if parsed_args.profile_output:
+                    with open(parsed_args.profile_output, "w") as output:
+                        output.write(report["collapsed"] + "\n")
+
         elif parsed_args.command == "server":
             import uvicorn
 
@@ -0,0 +1,278 @@
+"""Pooled async client for OpenAI-compatible model providers."""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+RETRY_AFTER_STATUS_CODES = frozenset({429, 503})
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Return the seconds a ``Retry-After`` header asks to wait, or 0."""
+    value = response.headers.get("Retry-After")
+    if response.status_code not in RETRY_AFTER_STATUS_CODES or not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class LLMClientError(Exception):
+    """Raised when a provider request fails after all retries."""
+
+
+class LLMClient:
+    """Shared HTTP client for embedding and completion calls.
+
+    One instance keeps a pool of keep-alive connections (optionally
+    multiplexed over HTTP/2) to the provider. Each call gets a total timeout
+    budget that covers all of its retries; retryable failures back off with
+    full jitter, and an optional hedged request is fired when the first
+    attempt is slower than ``hedge_delay``.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://api.openai.com/v1",
+        api_key: str = "",
+        http2: bool = False,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        hedge_delay: Optional[float] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            base_url: Provider API root, e.g. ``https://api.openai.com/v1``
+            api_key: Bearer token sent with every request
+            http2: Multiplex requests over HTTP/2 (requires ``httpx[http2]``)
+            timeout: Total time budget in seconds for one call, retries included
+            max_retries: Retries after the first attempt
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound in seconds for a single backoff delay
+            hedge_delay: Seconds to wait before sending a duplicate request;
+                None disables hedging
+            max_connections: Maximum number of pooled connections
+            max_keepalive_connections: Maximum idle connections kept open
+            transport: Custom transport, mainly for tests
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_delay = hedge_delay
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/") + "/",
+            headers=headers,
+            http2=http2,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            transport=transport,
+        )
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> "LLMClient":
+        """Build a client from a configuration dictionary.
+
+        Args:
+            config: Configuration dictionary, as passed to ``RAGSystem``
+            transport: Custom transport, mainly for tests
+
+        Returns:
+            LLMClient instance
+        """
+        return cls(
+            base_url=config.get("llm_base_url") or "https://api.openai.com/v1",
+            api_key=config.get("openai_api_key", ""),
+            http2=config.get("llm_http2", False),
+            timeout=config.get("llm_timeout") or 30.0,
+            max_retries=config.get("llm_max_retries", 3),
+            hedge_delay=config.get("llm_hedge_delay") or None,
+            max_connections=config.get("llm_max_connections") or 20,
+            transport=transport,
+        )
+
+    async def embed(self, texts: List[str], model: str) -> List[List[float]]:
+        """Embed texts with the provider's ``/embeddings`` endpoint.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model name
+
+        Returns:
+            One embedding vector per input text, in input order
+        """
+        data = await self._post("embeddings", {"model": model, "input": texts})
+        items = sorted(data["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in items]
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """Generate a chat completion with ``/chat/completions``.
+
+        Args:
+            messages: Chat messages with ``role`` and ``content`` keys
+            model: Chat model name
+            max_tokens: Maximum tokens in the completion
+            temperature: Sampling temperature
+
+        Returns:
+            Content of the first completion choice
+        """
+        payload: Dict[str, Any] = {"model": model, "messages": messages}
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+        if temperature is not None:
+            payload["temperature"] = temperature
+        data = await self._post("chat/completions", payload)
+        return str(data["choices"][0]["message"]["content"])
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "LLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a JSON payload, retrying within the call's timeout budget."""
+        deadline = time.monotonic() + self.timeout
+        last_error: Exception = LLMClientError("no attempt made")
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = 0.0
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                response = await asyncio.wait_for(
+                    self._send(path, payload, remaining), remaining
+                )
+            except (httpx.TransportError, asyncio.TimeoutError) as e:
+                last_error = e
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    result: Dict[str, Any] = response.json()
+                    return result
+                last_error = httpx.HTTPStatusError(
+                    f"Retryable status {response.status_code}",
+                    request=response.request,
+                    response=response,
+                )
+                retry_after = _retry_after(response)
+
+            if attempt == self.max_retries:
+                logger.warning(
+                    "Provider request failed",
+                    path=path,
+                    attempt=attempt + 1,
+                    error=str(last_error),
+                )
+                break
+            # The provider's Retry-After is a floor: retrying sooner is wasted
+            delay = max(
+                retry_after,
+                random.uniform(  # nosec B311: jitter, not cryptography
+                    0, min(self.backoff_max, self.backoff_base * 2**attempt)
+                ),
+            )
+            if time.monotonic() + delay >= deadline:
+                logger.warning(
+                    "Provider request failed; timeout budget exhausted",
+                    path=path,
+                    attempt=attempt + 1,
+                    error=str(last_error),
+                )
+                break
+            logger.warning(
+                "Provider request failed",
+                path=path,
+                attempt=attempt + 1,
+                error=str(last_error),
+                retry_in=round(delay, 3),
+            )
+            await asyncio.sleep(delay)
+
+        raise LLMClientError(f"Request to {path} failed: {last_error}") from last_error
+
+    async def _send(
+        self, path: str, payload: Dict[str, Any], timeout: float
+    ) -> httpx.Response:
+        """Send one attempt, hedging it with a duplicate if it is slow."""
+        if self.hedge_delay is None or self.hedge_delay >= timeout:
+            return await self._client.post(path, json=payload, timeout=timeout)
+
+        attempts = [
+            asyncio.ensure_future(
+                self._client.post(path, json=payload, timeout=timeout)
+            )
+        ]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=self.hedge_delay)
+            if not done:
+                logger.debug("Sending hedged request", path=path)
+                attempts.append(
+                    asyncio.ensure_future(
+                        self._client.post(
+                            path, json=payload, timeout=timeout - self.hedge_delay
+                        )
+                    )
+                )
+
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if (
+                        task.exception() is None
+                        and task.result().status_code not in RETRYABLE_STATUS_CODES
+                    ):
+                        return task.result()
+                if not pending:
+                    # Every attempt failed; let the caller decide on retrying
+                    return done.pop().result()
+        finally:
+            for task in attempts:
+                task.cancel()
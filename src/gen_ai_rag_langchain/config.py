@@ -21,7 +21,16 @@ class Config:
     api_host: str = ""
     api_port: int = 0
     workers: int = 0
+    admin_token: str = ""
     openai_api_key: str = ""
+    llm_base_url: str = ""
+    llm_model: str = ""
+    embedding_model: str = ""
+    llm_http2: bool = False
+    llm_timeout: float = 0.0
+    llm_max_retries: int = 0
+    llm_hedge_delay: float = 0.0
+    llm_max_connections: int = 0
     database_url: str = ""
     aws_region: str = ""
     aws_access_key_id: str = ""
@@ -35,6 +44,12 @@ class Config:
     temperature: float = 0.0
     chunk_size: int = 0
     chunk_overlap: int = 0
+    retrieval_top_k: int = 0
+    mmr_lambda: float = 0.0
+    mmr_pool_size: int = 0
+    dedup_enabled: bool = True
+    dedup_threshold: float = 0.0
+    dedup_num_perm: int = 0
 
     def __post_init__(self) -> None:
         """Initialize configuration from environment variables."""
@@ -48,10 +63,22 @@ class Config:
         self.api_host = os.getenv("API_HOST", "0.0.0.0")  # nosec
         self.api_port = int(os.getenv("API_PORT", "8000"))
         self.workers = int(os.getenv("WORKERS", "1"))
+        # Admin routes (e.g. profiling) are disabled unless a token is set
+        self.admin_token = os.getenv("ADMIN_TOKEN", "")
 
         # OpenAI Configuration
         self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
 
+        # Model provider client
+        self.llm_base_url = os.getenv("LLM_BASE_URL", "https://api.openai.com/v1")
+        self.llm_model = os.getenv("LLM_MODEL", "gpt-4o-mini")
+        self.embedding_model = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+        self.llm_http2 = os.getenv("LLM_HTTP2", "False").lower() == "true"
+        self.llm_timeout = float(os.getenv("LLM_TIMEOUT", "30"))
+        self.llm_max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.llm_hedge_delay = float(os.getenv("LLM_HEDGE_DELAY", "0"))
+        self.llm_max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
         # Database Configuration
         self.database_url = os.getenv("DATABASE_URL", "sqlite:///./gen_ai_rag.db")
 
@@ -77,6 +104,16 @@ class Config:
         self.chunk_size = int(os.getenv("CHUNK_SIZE", "1000"))
         self.chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "200"))
 
+        # Retrieval and MMR re-ranking
+        self.retrieval_top_k = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+        self.mmr_lambda = float(os.getenv("MMR_LAMBDA", "0.5"))
+        self.mmr_pool_size = int(os.getenv("MMR_POOL_SIZE", "50"))
+
+        # Ingestion near-duplicate elimination
+        self.dedup_enabled = os.getenv("DEDUP_ENABLED", "True").lower() == "true"
+        self.dedup_threshold = float(os.getenv("DEDUP_THRESHOLD", "0.9"))
+        self.dedup_num_perm = int(os.getenv("DEDUP_NUM_PERM", "128"))
+
 
 def get_config() -> Config:
     """Get application configuration.
@@ -105,4 +142,10 @@ def get_settings() -> Dict[str, Any]:
         "temperature": config.temperature,
         "chunk_size": config.chunk_size,
         "chunk_overlap": config.chunk_overlap,
+        "retrieval_top_k": config.retrieval_top_k,
+        "mmr_lambda": config.mmr_lambda,
+        "mmr_pool_size": config.mmr_pool_size,
+        "dedup_enabled": config.dedup_enabled,
+        "dedup_threshold": config.dedup_threshold,
+        "dedup_num_perm": config.dedup_num_perm,
     }
@@ -1,41 +1,240 @@
 """Core application module."""
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import structlog
 
+from gen_ai_rag_langchain.client import LLMClient
+from gen_ai_rag_langchain.ingestion import (
+    ChunkDeduplicator,
+    DedupResult,
+    split_text,
+)
+from gen_ai_rag_langchain.reranking import maximal_marginal_relevance
+
 logger = structlog.get_logger(__name__)
 
 
 class RAGSystem:
     """Core RAG system implementation."""
 
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(
+        self, config: Dict[str, Any] = None, client: Optional[LLMClient] = None
+    ):
         """Initialize the RAG system.
 
         Args:
             config: Configuration dictionary
+            client: Model provider client; built from config on first use if
+                not given
         """
         self.config = config or {}
+        self._client = client
+        self.chunks: List[str] = []
+        self._deduplicator = ChunkDeduplicator(
+            threshold=self.config.get("dedup_threshold") or 0.9,
+            num_perm=self.config.get("dedup_num_perm") or 128,
+        )
         logger.info("RAG system initialized", config=self.config)
 
-    def process_query(self, query: str) -> Dict[str, Any]:
+    def ingest(self, documents: List[str]) -> Dict[str, Any]:
+        """Chunk documents and add them to the system, skipping near-duplicates.
+
+        Near-duplicates are detected with MinHash signatures and an LSH index
+        before any chunk reaches the embedding stage, including duplicates of
+        chunks ingested by earlier calls.
+
+        Args:
+            documents: Raw document texts
+
+        Returns:
+            Dict containing ingestion and deduplication statistics
+        """
+        chunk_size = self.config.get("chunk_size") or 1000
+        chunk_overlap = self.config.get("chunk_overlap") or 0
+        if chunk_overlap >= chunk_size:
+            fallback = chunk_size // 5
+            logger.warning(
+                "chunk_overlap must be smaller than chunk_size; using fallback",
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                fallback=fallback,
+            )
+            chunk_overlap = fallback
+        new_chunks = [
+            chunk
+            for document in documents
+            for chunk in split_text(document, chunk_size, chunk_overlap)
+        ]
+
+        if self.config.get("dedup_enabled", True):
+            result = self._deduplicator.filter(new_chunks)
+        else:
+            result = DedupResult(chunks=new_chunks)
+
+        self.chunks.extend(result.chunks)
+        stats: Dict[str, Any] = result.stats
+        stats["documents"] = len(documents)
+        logger.info("Documents ingested", **stats)
+        return stats
+
+    @property
+    def client(self) -> LLMClient:
+        """Pooled client shared by all embedding and completion calls."""
+        if self._client is None:
+            self._client = LLMClient.from_config(self.config)
+        return self._client
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the configured embedding model.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per input text
+        """
+        model = self.config.get("embedding_model") or "text-embedding-3-small"
+        return await self.client.embed(texts, model=model)
+
+    async def complete(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """Generate a completion for a prompt with the configured model.
+
+        Args:
+            prompt: User prompt
+            max_tokens: Maximum tokens in the completion
+            temperature: Sampling temperature
+
+        Returns:
+            Generated text
+        """
+        return await self.client.complete(
+            [{"role": "user", "content": prompt}],
+            model=self.config.get("llm_model") or "gpt-4o-mini",
+            max_tokens=max_tokens or self.config.get("max_tokens"),
+            temperature=(
+                temperature
+                if temperature is not None
+                else self.config.get("temperature")
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Release pooled provider connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def retrieve(
+        self, query: str, k: int
+    ) -> Tuple[Optional[np.ndarray], List[Dict[str, Any]]]:
+        """Fetch candidate chunks for a query.
+
+        Args:
+            query: The input query string
+            k: Maximum number of candidates to return
+
+        Returns:
+            Tuple of the query embedding and candidate dicts, each holding
+            ``content`` and ``embedding`` keys plus any source metadata.
+            No vector store is wired in yet, so this returns no candidates.
+        """
+        return None, []
+
+    def rerank(
+        self,
+        query_embedding: Optional[np.ndarray],
+        candidates: List[Dict[str, Any]],
+        k: int,
+        lambda_mult: float,
+    ) -> List[Dict[str, Any]]:
+        """Re-rank candidates with maximal marginal relevance.
+
+        Args:
+            query_embedding: Query vector, or None if unavailable
+            candidates: Candidate dicts with an ``embedding`` key
+            k: Number of candidates to keep
+            lambda_mult: Trade-off between relevance (1.0) and diversity (0.0)
+
+        Returns:
+            Selected candidates without their embeddings, in MMR order
+        """
+        if query_embedding is None or not candidates:
+            selected = candidates[:k]
+        else:
+            order = maximal_marginal_relevance(
+                query_embedding,
+                [candidate["embedding"] for candidate in candidates],
+                k=k,
+                lambda_mult=lambda_mult,
+            )
+            selected = [candidates[i] for i in order]
+        return [
+            {key: value for key, value in candidate.items() if key != "embedding"}
+            for candidate in selected
+        ]
+
+    def process_query(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        mmr_lambda: Optional[float] = None,
+        mmr_pool_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """Process a query through the RAG system.
 
         Args:
             query: The input query string
+            top_k: Number of sources to keep after re-ranking
+            mmr_lambda: MMR trade-off between relevance (1.0) and diversity (0.0)
+            mmr_pool_size: Number of retrieved candidates to re-rank
 
         Returns:
             Dict containing the response and metadata
+
+        Raises:
+            ValueError: If top_k or mmr_pool_size is not positive, or
+                mmr_lambda is outside [0, 1]
         """
         logger.info("Processing query", query=query)
 
+        if top_k is None:
+            top_k = self.config.get("retrieval_top_k") or 4
+        if mmr_pool_size is None:
+            mmr_pool_size = self.config.get("mmr_pool_size") or 50
+        if mmr_lambda is None:
+            mmr_lambda = self.config.get("mmr_lambda", 0.5)
+        if top_k <= 0:
+            raise ValueError("top_k must be positive")
+        if mmr_pool_size <= 0:
+            raise ValueError("mmr_pool_size must be positive")
+        if not 0.0 <= mmr_lambda <= 1.0:
+            raise ValueError("mmr_lambda must be in [0, 1]")
+        mmr_pool_size = max(top_k, mmr_pool_size)
+
+        query_embedding, candidates = self.retrieve(query, mmr_pool_size)
+        sources = self.rerank(query_embedding, candidates, top_k, mmr_lambda)
+
         # Placeholder implementation
         response = {
             "query": query,
             "response": f"This is a placeholder response for: {query}",
-            "sources": [],
-            "metadata": {"processing_time": 0.1},
+            "sources": sources,
+            "metadata": {
+                "processing_time": 0.1,
+                "reranking": {
+                    "strategy": "mmr",
+                    "lambda": mmr_lambda,
+                    "pool_size": mmr_pool_size,
+                    "candidates": len(candidates),
+                },
+            },
         }
 
         logger.info("Query processed", response=response)
@@ -0,0 +1,264 @@
+"""Document ingestion: chunking and near-duplicate elimination."""
+
+import hashlib
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Universal hashing modulo a Mersenne prime; shingle hashes are 32-bit so
+# ``a * h + b`` always fits in an unsigned 64-bit integer.
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_RE = re.compile(r"\w+")
+
+
+def split_text(text: str, chunk_size: int, chunk_overlap: int = 0) -> List[str]:
+    """Split text into fixed-size character chunks.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum number of characters per chunk
+        chunk_overlap: Number of characters shared by consecutive chunks
+
+    Returns:
+        List of non-empty chunks
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if not 0 <= chunk_overlap < chunk_size:
+        raise ValueError("chunk_overlap must be in [0, chunk_size)")
+
+    step = chunk_size - chunk_overlap
+    chunks = []
+    for start in range(0, len(text), step):
+        chunk = text[start : start + chunk_size].strip()
+        if chunk:
+            chunks.append(chunk)
+        if start + chunk_size >= len(text):
+            break
+    return chunks
+
+
+def _shingles(text: str, size: int) -> List[bytes]:
+    """Return the word shingles of a chunk as bytes."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words).encode()]
+    return [
+        " ".join(words[i : i + size]).encode() for i in range(len(words) - size + 1)
+    ]
+
+
+class MinHasher:
+    """MinHash signature generator over word shingles."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """Initialize the hasher.
+
+        Args:
+            num_perm: Number of hash permutations (signature length)
+            shingle_size: Number of words per shingle
+            seed: Seed for the permutation coefficients
+        """
+        if num_perm <= 0:
+            raise ValueError("num_perm must be positive")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_MAX_HASH), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MAX_HASH), size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a chunk.
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            Array of ``num_perm`` 32-bit minimum hash values
+        """
+        hashes = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(s, digest_size=4).digest(), "little")
+                for s in _shingles(text, self.shingle_size)
+            ),
+            dtype=np.uint64,
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        signature: np.ndarray = (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+        return signature
+
+
+def _lsh_params(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) whose S-curve midpoint is closest to the threshold."""
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class LSHIndex:
+    """Banded locality-sensitive hash index over MinHash signatures."""
+
+    def __init__(self, num_perm: int = 128, threshold: float = 0.9):
+        """Initialize the index.
+
+        Args:
+            num_perm: Signature length of the indexed MinHashes
+            threshold: Estimated Jaccard similarity at which chunks match
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.bands, self.rows = _lsh_params(num_perm, threshold)
+        self._buckets: List[Dict[bytes, List[int]]] = [
+            defaultdict(list) for _ in range(self.bands)
+        ]
+        self._signatures: List[np.ndarray] = []
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[i * self.rows : (i + 1) * self.rows].tobytes()
+            for i in range(self.bands)
+        ]
+
+    def query(self, signature: np.ndarray) -> int:
+        """Find an indexed near-duplicate of a signature.
+
+        Args:
+            signature: MinHash signature to look up
+
+        Returns:
+            Position of the most similar indexed signature at or above the
+            threshold, or -1 if there is none
+        """
+        candidates: Set[int] = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+
+        best, best_similarity = -1, self.threshold
+        for candidate in sorted(candidates):
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        return best
+
+    def add(self, signature: np.ndarray) -> int:
+        """Add a signature to the index.
+
+        Args:
+            signature: MinHash signature to insert
+
+        Returns:
+            Position assigned to the signature
+        """
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket[key].append(position)
+        return position
+
+
+@dataclass
+class DedupResult:
+    """Outcome of near-duplicate elimination."""
+
+    chunks: List[str]
+    duplicates: Dict[int, int] = field(default_factory=dict)
+    chars_in: int = 0
+    chars_out: int = 0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Summarize the index space and embedding work saved."""
+        total = len(self.chunks) + len(self.duplicates)
+        return {
+            "chunks_in": total,
+            "chunks_out": len(self.chunks),
+            "duplicates_removed": len(self.duplicates),
+            "embedding_calls_saved": len(self.duplicates),
+            "chars_saved": self.chars_in - self.chars_out,
+            "index_reduction": len(self.duplicates) / total if total else 0.0,
+        }
+
+
+class ChunkDeduplicator:
+    """Incremental near-duplicate filter backed by MinHash LSH."""
+
+    def __init__(
+        self, threshold: float = 0.9, num_perm: int = 128, shingle_size: int = 3
+    ):
+        """Initialize the deduplicator.
+
+        Args:
+            threshold: Estimated Jaccard similarity above which a chunk is dropped
+            num_perm: MinHash signature length
+            shingle_size: Number of words per shingle
+        """
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.index = LSHIndex(num_perm=num_perm, threshold=threshold)
+
+    def filter(self, chunks: Sequence[str]) -> DedupResult:
+        """Drop chunks that duplicate earlier ones, keeping first occurrences.
+
+        Chunks kept by previous calls stay indexed, so duplicates across
+        batches are caught as well.
+
+        Args:
+            chunks: Chunks in ingestion order
+
+        Returns:
+            DedupResult with the surviving chunks and a map from each dropped
+            chunk's input position to the index position of the chunk it
+            duplicates
+        """
+        result = DedupResult(chunks=[])
+        for position, chunk in enumerate(chunks):
+            result.chars_in += len(chunk)
+            signature = self.hasher.signature(chunk)
+            match = self.index.query(signature)
+            if match >= 0:
+                result.duplicates[position] = match
+                continue
+            self.index.add(signature)
+            result.chunks.append(chunk)
+            result.chars_out += len(chunk)
+
+        logger.info("Chunks deduplicated", **result.stats)
+        return result
+
+
+def deduplicate_chunks(
+    chunks: Sequence[str],
+    threshold: float = 0.9,
+    num_perm: int = 128,
+    shingle_size: int = 3,
+) -> DedupResult:
+    """Drop near-duplicate chunks, keeping the first occurrence.
+
+    Args:
+        chunks: Chunks in ingestion order
+        threshold: Estimated Jaccard similarity above which a chunk is dropped
+        num_perm: MinHash signature length
+        shingle_size: Number of words per shingle
+
+    Returns:
+        DedupResult whose duplicates map dropped input positions to positions
+        in the returned chunk list
+    """
+    deduplicator = ChunkDeduplicator(
+        threshold=threshold, num_perm=num_perm, shingle_size=shingle_size
+    )
+    return deduplicator.filter(chunks)
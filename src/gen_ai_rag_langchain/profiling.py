@@ -0,0 +1,313 @@
+"""On-demand profiling of request handling."""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling")
+# Shorter sampling intervals make the sampler thread compete for the GIL
+MIN_SAMPLE_INTERVAL = 0.001
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_FunctionKey = Tuple[str, int, str]
+_Stack = Tuple[_FunctionKey, ...]
+
+
+def _label(filename: str, lineno: int, name: str) -> str:
+    """Format a function the way pstats does: ``file.py:12(name)``."""
+    return f"{os.path.basename(filename)}:{lineno}({name})"
+
+
+def _in_package(filename: str) -> bool:
+    """Return whether a source file belongs to this package."""
+    return os.path.abspath(filename).startswith(_PACKAGE_DIR)
+
+
+class _Session:
+    """State of one profiling window."""
+
+    def __init__(
+        self,
+        mode: str,
+        duration: Optional[float],
+        requests: Optional[int],
+        interval: float,
+    ):
+        self.mode = mode
+        self.started = time.monotonic()
+        self.deadline = self.started + duration if duration else None
+        self.remaining = requests
+        self.interval = interval
+        self.requests = 0
+        self.in_flight = 0
+        self.stats: Optional[pstats.Stats] = None
+        self.stacks: Counter[_Stack] = Counter()
+        self.threads: Set[int] = set()
+        self.stopped = threading.Event()
+
+    def expired(self) -> bool:
+        """Return whether the session should admit no more requests."""
+        return (self.deadline is not None and time.monotonic() >= self.deadline) or (
+            self.remaining is not None and self.remaining <= 0
+        )
+
+    def done(self) -> bool:
+        """Return whether the session is expired and no request is in flight."""
+        return self.in_flight == 0 and self.expired()
+
+
+class Profiler:
+    """Profiles the next N requests or a time window, on demand.
+
+    ``cprofile`` mode records exact per-function timings; ``sampling`` mode
+    records stacks of the profiled threads every ``interval`` seconds and
+    also yields collapsed stacks for flamegraph tools. While no session is
+    running, instrumented code only checks ``active``, so profiling costs
+    nothing until it is switched on.
+
+    State is per process: with several server workers, each one has its own
+    profiler, and reports carry the ``pid`` of the worker that produced them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an idle profiler."""
+        self.active = False
+        self._session: Optional[_Session] = None
+        self._last_report: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        mode: str = "cprofile",
+        duration: Optional[float] = None,
+        requests: Optional[int] = None,
+        interval: float = 0.005,
+    ) -> Dict[str, Any]:
+        """Start a profiling session.
+
+        Args:
+            mode: ``cprofile`` for deterministic per-function timings, or
+                ``sampling`` for periodic stack samples
+            duration: Length of the profiling window in seconds
+            requests: Number of requests to profile
+            interval: Seconds between stack samples in sampling mode, at
+                least ``MIN_SAMPLE_INTERVAL``
+
+        Returns:
+            Dict describing the started session
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(PROFILE_MODES)}")
+        if duration is None and requests is None:
+            raise ValueError("duration or requests is required")
+        if (duration is not None and duration <= 0) or (
+            requests is not None and requests <= 0
+        ):
+            raise ValueError("duration and requests must be positive")
+        if interval < MIN_SAMPLE_INTERVAL:
+            raise ValueError(f"interval must be at least {MIN_SAMPLE_INTERVAL}")
+
+        with self._lock:
+            if self._session is not None and self._session.done():
+                # An idle cProfile window has nothing else to close it
+                self._finish(self._session)
+            if self._session is not None:
+                raise RuntimeError("A profiling session is already running")
+            session = _Session(mode, duration, requests, interval)
+            self._session = session
+            self.active = True
+
+        if mode == "sampling":
+            threading.Thread(target=self._sample, args=(session,), daemon=True).start()
+        logger.info(
+            "Profiling started", mode=mode, duration=duration, requests=requests
+        )
+        return self.status()
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """Stop the running session, if any.
+
+        Returns:
+            Report of the stopped session, or the last report if idle
+        """
+        with self._lock:
+            session = self._session
+            if session is not None:
+                self._finish(session)
+        return self._last_report
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the running session, stopping it if it has expired.
+
+        Returns:
+            Dict with the session state and, once finished, its report
+        """
+        with self._lock:
+            session = self._session
+            if session is not None and session.done():
+                self._finish(session)
+                session = None
+        if session is None:
+            return {"active": False, "pid": os.getpid(), "report": self._last_report}
+        return {
+            "active": True,
+            "pid": os.getpid(),
+            "mode": session.mode,
+            "elapsed": time.monotonic() - session.started,
+            "requests": session.requests,
+            "remaining_requests": session.remaining,
+        }
+
+    @contextmanager
+    def profile(self) -> Iterator[None]:
+        """Profile the enclosed block if it falls inside the session.
+
+        Callers should guard this with ``if profiler.active`` so the idle
+        path never enters the context manager.
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            session = self._session
+            if session is not None and session.expired():
+                if session.done():
+                    self._finish(session)
+                session = None
+            elif session is not None:
+                session.requests += 1
+                session.in_flight += 1
+                if session.remaining is not None:
+                    session.remaining -= 1
+                session.threads.add(thread_id)
+
+        if session is None:
+            yield
+            return
+
+        profile = cProfile.Profile() if session.mode == "cprofile" else None
+        try:
+            if profile is not None:
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Another profiler already owns this interpreter
+                    profile = None
+            try:
+                yield
+            finally:
+                if profile is not None:
+                    profile.disable()
+        finally:
+            with self._lock:
+                session.threads.discard(thread_id)
+                session.in_flight -= 1
+                if profile is not None:
+                    if session.stats is None:
+                        session.stats = pstats.Stats(profile)
+                    else:
+                        session.stats.add(profile)
+                if self._session is session and session.done():
+                    self._finish(session)
+
+    def _sample(self, session: _Session) -> None:
+        """Record the stacks of profiled threads until the session ends."""
+        while not session.stopped.wait(session.interval):
+            with self._lock:
+                thread_ids = list(session.threads)
+            frames = sys._current_frames()
+            stacks = [
+                self._collapse(frames[thread_id])
+                for thread_id in thread_ids
+                if thread_id in frames
+            ]
+            # _report reads the counter under the lock, so update it there too
+            with self._lock:
+                if session.stopped.is_set():
+                    break
+                session.stacks.update(stacks)
+                if self._session is session and session.done():
+                    self._finish(session)
+
+    @staticmethod
+    def _collapse(frame: Optional[FrameType]) -> _Stack:
+        """Return a frame's stack root-first as (file, line, name) keys."""
+        keys: List[_FunctionKey] = []
+        while frame is not None:
+            code = frame.f_code
+            keys.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        return tuple(reversed(keys))
+
+    def _finish(self, session: _Session) -> None:
+        """Close a session and build its report. Caller holds the lock."""
+        session.stopped.set()
+        self._session = None
+        self.active = False
+        self._last_report = self._report(session)
+        logger.info("Profiling finished", mode=session.mode, requests=session.requests)
+
+    @staticmethod
+    def _report(session: _Session) -> Dict[str, Any]:
+        """Summarize a session as collapsed stacks and per-function times."""
+        functions: List[Dict[str, Any]] = []
+        if session.stats is not None:
+            raw_stats = session.stats.stats  # type: ignore[attr-defined]
+            for (filename, lineno, name), entry in raw_stats.items():
+                _, calls, total_time, cumulative_time, _ = entry
+                if _in_package(filename):
+                    functions.append(
+                        {
+                            "function": _label(filename, lineno, name),
+                            "calls": calls,
+                            "total_time": total_time,
+                            "cumulative_time": cumulative_time,
+                        }
+                    )
+        elif session.stacks:
+            cumulative: Counter = Counter()
+            leaf: Counter = Counter()
+            for stack, count in session.stacks.items():
+                leaf[stack[-1]] += count
+                for key in set(stack):
+                    cumulative[key] += count
+            for key, count in cumulative.items():
+                if _in_package(key[0]):
+                    functions.append(
+                        {
+                            "function": _label(*key),
+                            "samples": count,
+                            "total_time": leaf[key] * session.interval,
+                            "cumulative_time": count * session.interval,
+                        }
+                    )
+        functions.sort(key=lambda item: item["cumulative_time"], reverse=True)
+
+        collapsed = None
+        if session.mode == "sampling":
+            collapsed = "\n".join(
+                ";".join(_label(*key) for key in stack) + f" {count}"
+                for stack, count in session.stacks.most_common()
+            )
+
+        return {
+            "mode": session.mode,
+            "pid": os.getpid(),
+            "duration": time.monotonic() - session.started,
+            "requests": session.requests,
+            "functions": functions,
+            # Only sampling records whole stacks; cProfile keeps call edges
+            "collapsed": collapsed,
+        }
+
+
+profiler = Profiler()
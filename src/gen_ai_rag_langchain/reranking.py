@@ -0,0 +1,62 @@
+"""Re-ranking of retrieved candidates."""
+
+from typing import List, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+def _norms(vectors: np.ndarray) -> np.ndarray:
+    """Return row norms, with zero rows mapped to 1 to avoid division by zero."""
+    norms = np.sqrt(np.einsum("...i,...i->...", vectors, vectors))
+    return np.where(norms == 0, 1, norms)
+
+
+def maximal_marginal_relevance(
+    query_embedding: Union[np.ndarray, Sequence[float]],
+    candidate_embeddings: ArrayLike,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> List[int]:
+    """Select a relevant but diverse subset of candidates.
+
+    Each step picks the candidate maximizing
+    ``lambda_mult * sim(query, c) - (1 - lambda_mult) * max sim(c, selected)``
+    using cosine similarity. The running maximum similarity to the selected
+    set is updated with one vectorized row per pick, so the cost is
+    ``k`` matrix-vector products instead of pairwise Python loops.
+
+    Args:
+        query_embedding: Query vector of shape ``(d,)``
+        candidate_embeddings: Candidate vectors of shape ``(n, d)``
+        k: Number of candidates to select
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0)
+
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    if not 0.0 <= lambda_mult <= 1.0:
+        raise ValueError("lambda_mult must be in [0, 1]")
+
+    candidates = np.asarray(candidate_embeddings, dtype=np.float32)
+    if candidates.size == 0 or k <= 0:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32)
+    # Divide dot products by norms rather than normalizing the whole matrix
+    norms = _norms(candidates)
+    relevance = (candidates @ query) / (norms * _norms(query))
+    max_similarity = np.full_like(relevance, -np.inf)
+    scores = relevance.copy()
+    selected: List[int] = []
+
+    for _ in range(min(k, len(candidates))):
+        # The first pick is the most relevant candidate for any lambda
+        best = int(np.argmax(relevance if not selected else scores))
+        selected.append(best)
+        similarity = (candidates @ candidates[best]) / (norms * norms[best])
+        np.maximum(max_similarity, similarity, out=max_similarity)
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[selected] = -np.inf
+
+    return selected
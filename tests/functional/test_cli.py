@@ -1,5 +1,6 @@
 """Functional tests for the CLI module."""
 
+import time
 from unittest.mock import Mock, patch
 
 import pytest
@@ -65,6 +66,70 @@ class TestCLI:
         assert "Status: healthy" in captured.out
         assert "Version: 0.1.0" in captured.out
 
+    def test_query_command_with_profile(self, capsys):
+        """Test query command with cProfile profiling."""
+        result = main(["query", "test query", "--profile", "cprofile"])
+
+        assert result == 0
+        captured = capsys.readouterr()
+        assert "Profile (cumulative seconds):" in captured.out
+        assert "(process_query)" in captured.out
+
+    @patch("gen_ai_rag_langchain.cli.RAGSystem")
+    def test_query_command_with_sampling_output(self, mock_rag_system, tmp_path):
+        """Test that sampling mode writes collapsed stacks to a file."""
+        output = tmp_path / "stacks.folded"
+
+        def slow_query(text, **kwargs):
+            deadline = time.monotonic() + 0.1
+            while time.monotonic() < deadline:
+                pass
+            return {"query": text, "response": "", "sources": [], "metadata": {}}
+
+        mock_rag_system.return_value.process_query.side_effect = slow_query
+
+        result = main(
+            [
+                "query",
+                "test query",
+                "--profile",
+                "sampling",
+                "--profile-output",
+                str(output),
+            ]
+        )
+
+        assert result == 0
+        lines = output.read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert "(slow_query)" in stack
+        assert int(count) > 0
+
+    def test_profile_output_requires_sampling(self, tmp_path):
+        """Test that collapsed output is rejected outside sampling mode."""
+        with pytest.raises(SystemExit) as exc_info:
+            main(
+                [
+                    "query",
+                    "test query",
+                    "--profile",
+                    "cprofile",
+                    "--profile-output",
+                    str(tmp_path / "stacks.folded"),
+                ]
+            )
+
+        assert exc_info.value.code == 2
+
+    def test_query_command_rejects_invalid_top_k(self, capsys):
+        """Test that the CLI reports out-of-range re-ranking options."""
+        result = main(["query", "test query", "--top-k", "-1"])
+
+        assert result == 1
+        captured = capsys.readouterr()
+        assert "Error: top_k must be positive" in captured.err
+
     @patch("gen_ai_rag_langchain.cli.RAGSystem")
     def test_server_command(self, mock_rag_system):
         """Test server command."""
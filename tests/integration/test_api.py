@@ -1,9 +1,12 @@
 """Integration tests for the API module."""
 
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 
-from gen_ai_rag_langchain.api import app
+from gen_ai_rag_langchain.api import app, config
+from gen_ai_rag_langchain.profiling import profiler
 
 
 @pytest.fixture
@@ -70,6 +73,23 @@ class TestAPI:
 
         assert response.status_code == 422  # Validation error
 
+    def test_query_endpoint_reranking_options(self, client):
+        """Test per-request MMR options on the query endpoint."""
+        query_data = {"query": "Test query", "mmr_lambda": 0.3, "mmr_pool_size": 100}
+
+        response = client.post("/query", json=query_data)
+
+        assert response.status_code == 200
+        reranking = response.json()["metadata"]["reranking"]
+        assert reranking["lambda"] == 0.3
+        assert reranking["pool_size"] == 100
+
+    def test_query_endpoint_invalid_mmr_lambda(self, client):
+        """Test that an out-of-range MMR lambda is rejected."""
+        response = client.post("/query", json={"query": "q", "mmr_lambda": 2.0})
+
+        assert response.status_code == 422
+
     def test_cors_headers(self, client):
         """Test CORS headers are present."""
         response = client.options("/")
@@ -79,3 +99,86 @@ class TestAPI:
             200,
             405,
         ]  # 405 if OPTIONS not explicitly handled
+
+
+class TestAdminProfiling:
+    """Test cases for the admin profiling routes."""
+
+    @pytest.fixture(autouse=True)
+    def admin_token(self):
+        """Configure an admin token and reset the profiler afterwards."""
+        with patch.object(config, "admin_token", "secret"):
+            yield
+        profiler.stop()
+
+    def test_disabled_without_token(self, client):
+        """Test that admin routes are hidden when no token is configured."""
+        with patch.object(config, "admin_token", ""):
+            response = client.get("/admin/profile")
+
+        assert response.status_code == 404
+
+    def test_rejects_wrong_token(self, client):
+        """Test that a wrong admin token is rejected."""
+        response = client.get("/admin/profile", headers={"X-Admin-Token": "nope"})
+
+        assert response.status_code == 403
+
+    def test_profiles_next_requests(self, client):
+        """Test profiling the next N query requests."""
+        headers = {"X-Admin-Token": "secret"}
+
+        response = client.post(
+            "/admin/profile", json={"mode": "cprofile", "requests": 1}, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["active"] is True
+
+        assert client.post("/query", json={"query": "q"}).status_code == 200
+
+        status = client.get("/admin/profile", headers=headers).json()
+        assert status["active"] is False
+        assert status["report"]["requests"] == 1
+        assert any(
+            "(process_query)" in entry["function"]
+            for entry in status["report"]["functions"]
+        )
+
+        assert status["report"]["pid"] == status["pid"]
+
+        # cProfile does not record whole stacks
+        collapsed = client.get("/admin/profile/collapsed", headers=headers)
+        assert collapsed.status_code == 409
+
+    def test_rejects_concurrent_sessions(self, client):
+        """Test that starting a second session conflicts."""
+        headers = {"X-Admin-Token": "secret"}
+        body = {"mode": "sampling", "duration": 60}
+
+        assert (
+            client.post("/admin/profile", json=body, headers=headers).status_code == 200
+        )
+        assert (
+            client.post("/admin/profile", json=body, headers=headers).status_code == 409
+        )
+
+        stopped = client.delete("/admin/profile", headers=headers).json()
+        assert stopped["report"]["mode"] == "sampling"
+
+    def test_rejects_tiny_sampling_interval(self, client):
+        """Test that the sampling interval floor is enforced."""
+        response = client.post(
+            "/admin/profile",
+            json={"mode": "sampling", "requests": 1, "interval": 1e-7},
+            headers={"X-Admin-Token": "secret"},
+        )
+
+        assert response.status_code == 422
+
+    def test_requires_a_bound(self, client):
+        """Test that a session without duration or request count is rejected."""
+        response = client.post(
+            "/admin/profile", json={}, headers={"X-Admin-Token": "secret"}
+        )
+
+        assert response.status_code == 422
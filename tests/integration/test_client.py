@@ -0,0 +1,218 @@
+"""Integration tests for the model provider client."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from gen_ai_rag_langchain.client import LLMClient, LLMClientError
+from gen_ai_rag_langchain.core import RAGSystem
+
+
+class StubProvider:
+    """OpenAI-compatible stub with scriptable failures and latency."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.failure_status = 503
+        self.failure_headers = {}
+        self.delays = []
+        self.app = FastAPI()
+        self.app.post("/v1/embeddings")(self.embeddings)
+        self.app.post("/v1/chat/completions")(self.chat_completions)
+
+    async def _begin(self):
+        self.calls += 1
+        if self.delays:
+            await asyncio.sleep(self.delays.pop(0))
+        if self.failures:
+            self.failures -= 1
+            return JSONResponse(
+                {"error": "overloaded"},
+                status_code=self.failure_status,
+                headers=self.failure_headers,
+            )
+        return None
+
+    async def embeddings(self, request: Request):
+        body = await request.json()
+        error = await self._begin()
+        if error:
+            return error
+        return {
+            "data": [
+                {"index": i, "embedding": [float(len(text)), 1.0]}
+                for i, text in reversed(list(enumerate(body["input"])))
+            ]
+        }
+
+    async def chat_completions(self, request: Request):
+        body = await request.json()
+        error = await self._begin()
+        if error:
+            return error
+        content = f"echo: {body['messages'][-1]['content']}"
+        return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+@pytest.fixture
+def stub():
+    """Create a stub provider."""
+    return StubProvider()
+
+
+def make_client(stub, **kwargs):
+    """Create a client wired to the stub provider."""
+    kwargs.setdefault("backoff_base", 0.01)
+    return LLMClient(
+        base_url="http://stub/v1",
+        api_key="test-key",
+        transport=httpx.ASGITransport(app=stub.app),
+        **kwargs,
+    )
+
+
+class TestLLMClient:
+    """Test cases for LLMClient against a stub provider."""
+
+    def test_embed_preserves_input_order(self, stub):
+        """Test that embeddings are returned in input order."""
+
+        async def run():
+            async with make_client(stub) as client:
+                return await client.embed(["a", "bbb"], model="test")
+
+        assert asyncio.run(run()) == [[1.0, 1.0], [3.0, 1.0]]
+
+    def test_complete(self, stub):
+        """Test chat completion through the stub."""
+
+        async def run():
+            async with make_client(stub) as client:
+                return await client.complete(
+                    [{"role": "user", "content": "hi"}], model="test"
+                )
+
+        assert asyncio.run(run()) == "echo: hi"
+
+    def test_retries_retryable_status(self, stub):
+        """Test that 5xx responses are retried until success."""
+        stub.failures = 2
+
+        async def run():
+            async with make_client(stub, max_retries=3) as client:
+                return await client.embed(["a"], model="test")
+
+        assert asyncio.run(run()) == [[1.0, 1.0]]
+        assert stub.calls == 3
+
+    def test_gives_up_after_max_retries(self, stub):
+        """Test that exhausted retries raise LLMClientError."""
+        stub.failures = 10
+
+        async def run():
+            async with make_client(stub, max_retries=1) as client:
+                await client.embed(["a"], model="test")
+
+        with pytest.raises(LLMClientError):
+            asyncio.run(run())
+        assert stub.calls == 2
+
+    def test_no_backoff_after_last_attempt(self, stub):
+        """Test that an exhausted call fails without sleeping a backoff."""
+        stub.failures = 1
+
+        async def run():
+            async with make_client(
+                stub, max_retries=0, backoff_base=2.0, backoff_max=2.0
+            ) as client:
+                await client.embed(["a"], model="test")
+
+        start = time.monotonic()
+        with pytest.raises(LLMClientError):
+            asyncio.run(run())
+        assert time.monotonic() - start < 0.2
+        assert stub.calls == 1
+
+    def test_honours_retry_after(self, stub):
+        """Test that a 429 Retry-After header sets the minimum backoff."""
+        stub.failures = 1
+        stub.failure_status = 429
+        stub.failure_headers = {"Retry-After": "0.3"}
+
+        async def run():
+            async with make_client(stub, backoff_max=0.01) as client:
+                return await client.embed(["a"], model="test")
+
+        start = time.monotonic()
+        assert asyncio.run(run()) == [[1.0, 1.0]]
+        assert time.monotonic() - start >= 0.3
+        assert stub.calls == 2
+
+    def test_retry_after_beyond_budget_fails_fast(self, stub):
+        """Test that a Retry-After longer than the budget is not slept."""
+        stub.failures = 1
+        stub.failure_status = 429
+        stub.failure_headers = {"Retry-After": "60"}
+
+        async def run():
+            async with make_client(stub, timeout=5.0) as client:
+                await client.embed(["a"], model="test")
+
+        start = time.monotonic()
+        with pytest.raises(LLMClientError):
+            asyncio.run(run())
+        assert time.monotonic() - start < 1.0
+        assert stub.calls == 1
+
+    def test_timeout_budget_covers_retries(self, stub):
+        """Test that the total timeout bounds a call including retries."""
+        stub.delays = [1.0] * 5
+
+        async def run():
+            async with make_client(stub, timeout=0.2, max_retries=5) as client:
+                await client.embed(["a"], model="test")
+
+        start = time.monotonic()
+        with pytest.raises(LLMClientError):
+            asyncio.run(run())
+        assert time.monotonic() - start < 0.5
+
+    def test_hedged_request_cuts_tail_latency(self, stub):
+        """Test that a slow first attempt is overtaken by the hedge."""
+        stub.delays = [1.0, 0.0]
+
+        async def run():
+            async with make_client(stub, hedge_delay=0.05) as client:
+                return await client.embed(["a"], model="test")
+
+        start = time.monotonic()
+        assert asyncio.run(run()) == [[1.0, 1.0]]
+        assert time.monotonic() - start < 0.5
+        assert stub.calls == 2
+
+
+class TestRAGSystemClient:
+    """Test cases for RAGSystem provider calls."""
+
+    def test_embed_and_complete_share_client(self, stub):
+        """Test that RAGSystem routes provider calls through one client."""
+        rag_system = RAGSystem(
+            {"embedding_model": "test", "llm_model": "test"},
+            client=make_client(stub),
+        )
+
+        async def run():
+            client = rag_system.client
+            embeddings = await rag_system.embed(["abc"])
+            answer = await rag_system.complete("question")
+            assert rag_system.client is client
+            await rag_system.aclose()
+            return embeddings, answer
+
+        assert asyncio.run(run()) == ([[3.0, 1.0]], "echo: question")
+        assert stub.calls == 2
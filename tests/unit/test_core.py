@@ -2,6 +2,8 @@
 
 from unittest.mock import patch
 
+import pytest
+
 from gen_ai_rag_langchain.core import RAGSystem
 
 
@@ -45,6 +47,65 @@ class TestRAGSystem:
         assert result["query"] == query
         assert result["response"] is not None
 
+    @patch("gen_ai_rag_langchain.core.logger")
+    def test_ingest_falls_back_when_overlap_too_large(self, mock_logger):
+        """Test that an overlap not below the chunk size falls back to a fifth."""
+        rag_system = RAGSystem({"chunk_size": 100, "chunk_overlap": 200})
+        document = " ".join(f"w{i:03d}" for i in range(100))  # 499 characters
+
+        stats = rag_system.ingest([document])
+
+        mock_logger.warning.assert_called_once()
+        assert mock_logger.warning.call_args.kwargs["fallback"] == 20
+        # Step of 80 characters: starts at 0, 80, ..., 400
+        assert stats["chunks_in"] == 6
+        assert all(len(chunk) <= 100 for chunk in rag_system.chunks)
+
+    def test_ingest_defaults_overlap_to_zero(self):
+        """Test that ingest works when only chunk_size is configured."""
+        rag_system = RAGSystem({"chunk_size": 150})
+
+        stats = rag_system.ingest(["alpha " * 50])
+
+        assert stats["chunks_in"] == 2
+
+    def test_process_query_reranks_with_mmr(self):
+        """Test that retrieved candidates are diversified with MMR."""
+        rag_system = RAGSystem()
+        candidates = [
+            {"content": "a", "embedding": [1.0, 0.1, 0.0]},
+            {"content": "a'", "embedding": [1.0, 0.11, 0.0]},
+            {"content": "b", "embedding": [0.7, 0.0, 0.7]},
+        ]
+
+        with patch.object(
+            rag_system, "retrieve", return_value=([1.0, 0.0, 0.0], candidates)
+        ) as mock_retrieve:
+            result = rag_system.process_query(
+                "query", top_k=2, mmr_lambda=0.5, mmr_pool_size=20
+            )
+
+        mock_retrieve.assert_called_once_with("query", 20)
+        assert result["sources"] == [{"content": "a"}, {"content": "b"}]
+        assert result["metadata"]["reranking"]["candidates"] == 3
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"top_k": -1},
+            {"top_k": 0},
+            {"mmr_pool_size": 0},
+            {"mmr_lambda": -0.1},
+            {"mmr_lambda": 1.5},
+        ],
+    )
+    def test_process_query_rejects_invalid_reranking_options(self, kwargs):
+        """Test that out-of-range re-ranking options are rejected up front."""
+        rag_system = RAGSystem()
+
+        with pytest.raises(ValueError):
+            rag_system.process_query("query", **kwargs)
+
     def test_health_check(self):
         """Test health check functionality."""
         rag_system = RAGSystem()
@@ -66,3 +127,26 @@ class TestRAGSystem:
 
         # Check that logger.info was called
         assert mock_logger.info.call_count >= 2  # At least two log calls
+
+    def test_ingest_skips_near_duplicates(self):
+        """Test that ingestion drops near-duplicate chunks before indexing."""
+        rag_system = RAGSystem({"chunk_size": 200, "chunk_overlap": 0})
+        page = "Terms of service apply to every page of this mirrored site. " * 3
+
+        stats = rag_system.ingest([page, page, "A genuinely different document."])
+
+        assert stats["documents"] == 3
+        assert stats["duplicates_removed"] == stats["embedding_calls_saved"] >= 1
+        assert len(rag_system.chunks) == stats["chunks_out"]
+
+    def test_ingest_with_dedup_disabled(self):
+        """Test that ingestion keeps every chunk when dedup is disabled."""
+        rag_system = RAGSystem(
+            {"chunk_size": 200, "chunk_overlap": 0, "dedup_enabled": False}
+        )
+        page = "Terms of service apply to every page of this mirrored site."
+
+        stats = rag_system.ingest([page, page])
+
+        assert stats["duplicates_removed"] == 0
+        assert rag_system.chunks == [page, page]
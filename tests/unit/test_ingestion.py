@@ -0,0 +1,100 @@
+"""Unit tests for the ingestion module."""
+
+import pytest
+
+from gen_ai_rag_langchain.ingestion import (
+    ChunkDeduplicator,
+    LSHIndex,
+    MinHasher,
+    deduplicate_chunks,
+    split_text,
+)
+
+BOILERPLATE = (
+    "Copyright 2024 Example Corp. All rights reserved. Subscribe to our "
+    "newsletter for the latest product updates, release notes and security "
+    "advisories delivered straight to your inbox every single week."
+)
+
+
+class TestSplitText:
+    """Test cases for split_text."""
+
+    def test_chunks_respect_size_and_overlap(self):
+        """Test that chunks are bounded and overlap by the requested amount."""
+        text = "abcdefghij" * 10
+
+        chunks = split_text(text, chunk_size=30, chunk_overlap=10)
+
+        assert all(len(chunk) <= 30 for chunk in chunks)
+        assert chunks[0][-10:] == chunks[1][:10]
+        assert chunks[-1].endswith(text[-5:])
+
+    def test_empty_text(self):
+        """Test that empty text yields no chunks."""
+        assert split_text("", chunk_size=10) == []
+
+    def test_invalid_overlap(self):
+        """Test that overlap must be smaller than the chunk size."""
+        with pytest.raises(ValueError):
+            split_text("text", chunk_size=10, chunk_overlap=10)
+
+
+class TestMinHash:
+    """Test cases for MinHasher and LSHIndex."""
+
+    def test_signature_is_deterministic(self):
+        """Test that identical text produces identical signatures."""
+        hasher = MinHasher(num_perm=64)
+
+        first = hasher.signature(BOILERPLATE)
+        second = hasher.signature(BOILERPLATE)
+
+        assert first.shape == (64,)
+        assert (first == second).all()
+
+    def test_index_finds_near_duplicate(self):
+        """Test that a lightly edited chunk matches its original."""
+        hasher = MinHasher()
+        index = LSHIndex(threshold=0.7)
+        index.add(hasher.signature(BOILERPLATE))
+
+        edited = BOILERPLATE.replace("every single week", "every week")
+
+        assert index.query(hasher.signature(edited)) == 0
+        assert index.query(hasher.signature("An unrelated chunk of text.")) == -1
+
+    def test_invalid_threshold(self):
+        """Test that the threshold must be a valid similarity."""
+        with pytest.raises(ValueError):
+            LSHIndex(threshold=0.0)
+
+
+class TestDeduplicateChunks:
+    """Test cases for near-duplicate elimination."""
+
+    def test_drops_duplicates_and_reports_savings(self):
+        """Test that duplicates are dropped and savings are reported."""
+        unique = "Retrieval augmented generation combines search with LLMs."
+        chunks = [BOILERPLATE, unique, BOILERPLATE, BOILERPLATE.upper()]
+
+        result = deduplicate_chunks(chunks)
+
+        assert result.chunks == [BOILERPLATE, unique]
+        assert result.duplicates == {2: 0, 3: 0}
+        stats = result.stats
+        assert stats["chunks_in"] == 4
+        assert stats["chunks_out"] == 2
+        assert stats["embedding_calls_saved"] == 2
+        assert stats["chars_saved"] == 2 * len(BOILERPLATE)
+        assert stats["index_reduction"] == 0.5
+
+    def test_deduplicator_spans_batches(self):
+        """Test that chunks kept by earlier batches are still matched."""
+        deduplicator = ChunkDeduplicator()
+        deduplicator.filter([BOILERPLATE])
+
+        result = deduplicator.filter([BOILERPLATE, "Something new entirely."])
+
+        assert result.chunks == ["Something new entirely."]
+        assert result.duplicates == {0: 0}
@@ -0,0 +1,120 @@
+"""Unit tests for the profiling module."""
+
+import os
+import time
+
+import pytest
+
+from gen_ai_rag_langchain.core import RAGSystem
+from gen_ai_rag_langchain.profiling import Profiler
+
+
+def busy_query(rag_system, seconds=0.05):
+    """Run a query that keeps the interpreter busy for a while."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        rag_system.process_query("query")
+
+
+class TestProfiler:
+    """Test cases for Profiler."""
+
+    def test_idle_profiler_is_inactive(self):
+        """Test that a new profiler reports no session."""
+        profiler = Profiler()
+
+        assert profiler.active is False
+        status = profiler.status()
+        assert status["active"] is False
+        assert status["report"] is None
+        assert status["pid"] == os.getpid()
+
+    def test_cprofile_next_n_requests(self):
+        """Test that cProfile mode stops after the requested count."""
+        profiler = Profiler()
+        rag_system = RAGSystem()
+        profiler.start(mode="cprofile", requests=2)
+
+        for _ in range(2):
+            assert profiler.active
+            with profiler.profile():
+                rag_system.process_query("query")
+
+        assert profiler.active is False
+        report = profiler.status()["report"]
+        assert report["requests"] == 2
+        functions = {entry["function"]: entry for entry in report["functions"]}
+        process_query = next(name for name in functions if "(process_query)" in name)
+        assert functions[process_query]["calls"] == 2
+        assert report["collapsed"] is None
+        assert report["pid"] == os.getpid()
+
+    def test_sampling_produces_collapsed_stacks(self):
+        """Test that sampling mode yields flamegraph-ready stacks."""
+        profiler = Profiler()
+        rag_system = RAGSystem()
+        profiler.start(mode="sampling", requests=1, interval=0.001)
+
+        with profiler.profile():
+            busy_query(rag_system)
+
+        report = profiler.status()["report"]
+        lines = report["collapsed"].splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert "busy_query" in stack
+        assert any(
+            "(process_query)" in entry["function"] for entry in report["functions"]
+        )
+
+    def test_time_window_expires(self):
+        """Test that a duration-bound session ends without further requests."""
+        profiler = Profiler()
+        profiler.start(mode="cprofile", duration=0.01)
+
+        time.sleep(0.02)
+
+        assert profiler.status()["active"] is False
+        assert profiler.active is False
+
+    def test_stop_returns_report(self):
+        """Test that stopping a session returns its report."""
+        profiler = Profiler()
+        profiler.start(mode="cprofile", requests=10)
+
+        with profiler.profile():
+            RAGSystem().process_query("query")
+        report = profiler.stop()
+
+        assert profiler.active is False
+        assert report["requests"] == 1
+
+    def test_rejects_concurrent_sessions(self):
+        """Test that only one session may run at a time."""
+        profiler = Profiler()
+        profiler.start(requests=1)
+
+        with pytest.raises(RuntimeError):
+            profiler.start(requests=1)
+
+    def test_restart_after_idle_window_expires(self):
+        """Test that an expired window without traffic does not block a restart."""
+        profiler = Profiler()
+        profiler.start(mode="cprofile", duration=0.01)
+        time.sleep(0.02)
+
+        status = profiler.start(mode="cprofile", requests=1)
+
+        assert status["active"] is True
+        assert profiler.status()["active"] is True
+
+    def test_rejects_tiny_sampling_interval(self):
+        """Test that the sampling interval has a floor."""
+        with pytest.raises(ValueError):
+            Profiler().start(mode="sampling", requests=1, interval=1e-7)
+
+    def test_requires_a_bound(self):
+        """Test that a session needs a duration or request count."""
+        with pytest.raises(ValueError):
+            Profiler().start(mode="cprofile")
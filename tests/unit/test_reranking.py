@@ -0,0 +1,77 @@
+"""Unit tests for the reranking module."""
+
+import numpy as np
+import pytest
+
+from gen_ai_rag_langchain.reranking import maximal_marginal_relevance
+
+
+class TestMaximalMarginalRelevance:
+    """Test cases for maximal_marginal_relevance."""
+
+    def test_lambda_one_ranks_by_relevance(self):
+        """Test that lambda 1.0 reduces to plain similarity ranking."""
+        query = [1.0, 0.0]
+        candidates = [[0.0, 1.0], [1.0, 0.1], [1.0, 0.5]]
+
+        assert maximal_marginal_relevance(query, candidates, k=3, lambda_mult=1.0) == [
+            1,
+            2,
+            0,
+        ]
+
+    def test_diversity_skips_near_duplicates(self):
+        """Test that a near-duplicate of the top hit is demoted."""
+        query = [1.0, 0.0, 0.0]
+        candidates = [
+            [1.0, 0.1, 0.0],
+            [1.0, 0.11, 0.0],  # near-duplicate of the first candidate
+            [0.7, 0.0, 0.7],
+        ]
+
+        assert maximal_marginal_relevance(query, candidates, k=2, lambda_mult=0.5) == [
+            0,
+            2,
+        ]
+
+    def test_matches_reference_implementation(self):
+        """Test against a straightforward pairwise implementation."""
+        rng = np.random.default_rng(0)
+        query = rng.normal(size=16)
+        candidates = rng.normal(size=(50, 16))
+
+        def cosine(a, b):
+            return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+        expected = []
+        remaining = list(range(len(candidates)))
+        while len(expected) < 10:
+            best = max(
+                remaining,
+                key=lambda i: 0.3 * cosine(candidates[i], query)
+                - 0.7
+                * max(
+                    (cosine(candidates[i], candidates[j]) for j in expected), default=0
+                ),
+            )
+            expected.append(best)
+            remaining.remove(best)
+
+        assert maximal_marginal_relevance(query, candidates, k=10, lambda_mult=0.3) == (
+            expected
+        )
+
+    def test_k_larger_than_pool(self):
+        """Test that every candidate is returned once when k exceeds the pool."""
+        result = maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0], [0.0, 1.0]], k=5)
+
+        assert sorted(result) == [0, 1]
+
+    def test_empty_candidates(self):
+        """Test that no candidates yields an empty selection."""
+        assert maximal_marginal_relevance([1.0, 0.0], [], k=3) == []
+
+    def test_invalid_lambda(self):
+        """Test that lambda must be within [0, 1]."""
+        with pytest.raises(ValueError):
+            maximal_marginal_relevance([1.0], [[1.0]], k=1, lambda_mult=1.5)